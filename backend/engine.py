@@ -0,0 +1,44 @@
+import asyncio
+from typing import Optional
+from threat_detection import ThreatDetectionEngine
+
+# Shared engine so the models are loaded at most once per process
+_engine_task: Optional[asyncio.Task] = None
+
+
+async def _load_engine() -> ThreatDetectionEngine:
+    engine = ThreatDetectionEngine()
+    await engine.initialize()
+    return engine
+
+
+def _engine_failed(task: asyncio.Task) -> bool:
+    return task.done() and (task.cancelled() or task.exception() is not None)
+
+
+async def get_engine() -> ThreatDetectionEngine:
+    """Return the process-wide threat detection engine, loading models on first use"""
+    global _engine_task
+
+    if _engine_task is None or _engine_failed(_engine_task):
+        _engine_task = asyncio.create_task(_load_engine())
+
+    # Shielded so a cancelled caller (e.g. monitoring stopped mid-load) does not abandon the load
+    return await asyncio.shield(_engine_task)
+
+
+async def close_engine():
+    """Release the shared engine's background workers and connections, if it was loaded"""
+    global _engine_task
+
+    task, _engine_task = _engine_task, None
+    if task is None:
+        return
+
+    if not task.done():
+        task.cancel()
+    try:
+        engine = await task
+    except (asyncio.CancelledError, Exception):
+        return
+    await engine.close()
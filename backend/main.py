@@ -1,9 +1,13 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import asyncio
-from threat_detection import ThreatDetectionEngine
+import uvloop
+from engine import get_engine, close_engine
 
-app = FastAPI()
+asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Allow all origins for development (adjust in production)
 app.add_middleware(
@@ -14,11 +18,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-engine = ThreatDetectionEngine()
-
-@app.on_event("startup")
-async def startup_event():
-    await engine.initialize()
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_engine()
 
 @app.get("/status")
 async def get_status():
@@ -27,6 +29,7 @@ async def get_status():
 @app.post("/analyze")
 async def analyze_post(request: Request):
     data = await request.json()
+    engine = await get_engine()
     result = await engine.analyze_post(
         content=data.get("content", ""),
         author=data.get("author", ""),
@@ -1,4 +1,5 @@
-from fastapi import FastAPI, APIRouter, BackgroundTasks
+from fastapi import FastAPI, APIRouter, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -10,23 +11,34 @@ from typing import List, Optional
 import uuid
 from datetime import datetime, timezone
 import asyncio
-from threat_detection import ThreatDetectionEngine
+import uvloop
 from social_monitor import SocialMediaMonitor
+from engine import close_engine
+
+asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection, tuned for the bulk alert write path: a larger pool for
+# bursty writes, w=1 without retryable writes (alerts are deduplicated by a
+# unique index, so a lost write is simply retried on the next tick) and zstd
+# wire compression for the text-heavy alert documents
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get('MONGO_POOL_SIZE', '200')),
+    retryWrites=False,
+    w=1,
+    compressors='zstd'
+)
 db = client[os.environ['DB_NAME']]
 
-# Initialize threat detection and monitoring
-threat_engine = ThreatDetectionEngine()
-social_monitor = SocialMediaMonitor(threat_engine, db)
+# Initialize monitoring; the threat detection models are loaded on first use
+social_monitor = SocialMediaMonitor(db)
 
 # Create the main app without a prefix
-app = FastAPI(title="VIP Threat Monitoring System")
+app = FastAPI(title="VIP Threat Monitoring System", default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -59,10 +71,11 @@ async def root():
     return {"message": "VIP Threat Monitoring System API"}
 
 @api_router.get("/alerts", response_model=List[ThreatAlert])
-async def get_alerts():
-    """Get all threat alerts from the database"""
-    alerts = await db.threat_alerts.find().sort("timestamp", -1).limit(100).to_list(100)
-    return [ThreatAlert(**alert) for alert in alerts]
+async def get_alerts(limit: int = Query(100, ge=1, le=100)):
+    """Get the most recent threat alerts from the database (up to limit)"""
+    alerts = await db.threat_alerts.find({}, {"_id": 0}).sort("timestamp", -1).limit(limit).to_list(limit)
+    # response_model already validates the returned list; skip validating each document twice
+    return [ThreatAlert.model_construct(**alert) for alert in alerts]
 
 @api_router.get("/alerts/recent", response_model=List[ThreatAlert])
 async def get_recent_alerts():
@@ -70,9 +83,9 @@ async def get_recent_alerts():
     from datetime import timedelta
     cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
     alerts = await db.threat_alerts.find(
-        {"timestamp": {"$gte": cutoff_time}}
+        {"timestamp": {"$gte": cutoff_time}}, {"_id": 0}
     ).sort("timestamp", -1).to_list(50)
-    return [ThreatAlert(**alert) for alert in alerts]
+    return [ThreatAlert.model_construct(**alert) for alert in alerts]
 
 @api_router.get("/status", response_model=MonitoringStatus)
 async def get_monitoring_status():
@@ -80,7 +93,7 @@ async def get_monitoring_status():
     global monitoring_task
     is_running = monitoring_task is not None and not monitoring_task.done()
     
-    alerts_count = await db.threat_alerts.count_documents({})
+    alerts_count = await social_monitor.count_alerts()
     last_check = datetime.now(timezone.utc)
     
     return MonitoringStatus(
@@ -120,6 +133,7 @@ async def stop_monitoring():
 async def clear_alerts():
     """Clear all alerts from the database"""
     result = await db.threat_alerts.delete_many({})
+    social_monitor.invalidate_alert_counts()
     return {"message": f"Cleared {result.deleted_count} alerts"}
 
 @api_router.get("/test/generate-mock-alert")
@@ -138,6 +152,7 @@ async def generate_mock_alert():
     )
     
     await db.threat_alerts.insert_one(mock_alert.dict())
+    social_monitor.invalidate_alert_counts()
     return {"message": "Mock alert generated", "alert": mock_alert}
 
 # Include the router in the main app
@@ -162,8 +177,7 @@ logger = logging.getLogger(__name__)
 async def startup_event():
     """Initialize the application on startup"""
     logger.info("VIP Threat Monitoring System starting up...")
-    await threat_engine.initialize()
-    logger.info("Threat detection engine initialized")
+    await social_monitor.initialize()
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -177,5 +191,6 @@ async def shutdown_event():
         except asyncio.CancelledError:
             pass
     
+    await close_engine()
     client.close()
     logger.info("VIP Threat Monitoring System shutting down...")
\ No newline at end of file
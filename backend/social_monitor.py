@@ -1,30 +1,113 @@
 import asyncio
 import logging
 import os
-import random
+import itertools
+import time
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure, ServerSelectionTimeoutError
 import uuid
+from collections import defaultdict
+import ahocorasick
+from engine import get_engine
 
 class SocialMediaMonitor:
-    def __init__(self, threat_engine, database: AsyncIOMotorDatabase):
-        self.threat_engine = threat_engine
+    def __init__(self, database: AsyncIOMotorDatabase):
+        self.threat_engine = None  # Resolved lazily when monitoring starts
         self.db = database
         self.logger = logging.getLogger(__name__)
         self.is_monitoring = False
         
+        # Set once the alert indexes exist; retried when monitoring starts
+        self._indexes_ready = False
+        
+        # Alerts are buffered and written in bulk by a background flusher
+        self._alert_buffer: List[Dict] = []
+        self._alert_lock = asyncio.Lock()
+        self._flush_interval = 0.5
+        
+        # Timestamp shared by every alert created in the current monitoring tick
+        self._tick_time = datetime.now(timezone.utc)
+        
+        # Short-lived cache of alert counts for the status endpoints
+        self._counts_ttl = 5.0
+        self._counts_cache: Dict[str, tuple] = {}
+        
         # Get monitoring configuration from environment
         self.vip_target = os.environ.get('VIP_TARGET_NAME', 'Celebrity VIP')
         self.vip_username = os.environ.get('VIP_TARGET_USERNAME', '@celebrityvip')
         self.keywords = os.environ.get('MONITORING_KEYWORDS', 'Celebrity VIP,@celebrityvip').split(',')
         
+        # Single-pass keyword screen for inbound posts, independent of keyword count.
+        # The bare handle is included so impersonating usernames are still caught.
+        self._keyword_automaton = self._build_keyword_automaton(
+            self.keywords + [self.vip_username.lstrip('@')]
+        )
+        
         # Mock data for demonstration
         self.mock_posts = self._generate_mock_posts()
         
+        # Index mock posts by platform once so each tick is a dict lookup
+        self._posts_by_platform = defaultdict(list)
+        for post in self.mock_posts:
+            self._posts_by_platform[post["platform"]].append(post)
+        
+        # Round-robin demo feed: each tick "discovers" the next post per platform
+        self._feeds = {
+            platform: itertools.cycle(posts)
+            for platform, posts in self._posts_by_platform.items()
+        }
+        
+    @staticmethod
+    def _build_keyword_automaton(keywords: List[str]) -> ahocorasick.Automaton:
+        """Compile monitoring keywords into an Aho-Corasick automaton"""
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            keyword = keyword.strip()
+            if keyword:
+                automaton.add_word(keyword.lower(), keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _mentions_vip(self, post: Dict) -> bool:
+        """Check whether a post's content or author mentions any monitoring keyword"""
+        if not len(self._keyword_automaton):
+            return True  # No keywords configured; don't filter anything
+        
+        for text in (post["content"], post["author"]):
+            for _ in self._keyword_automaton.iter(text.lower()):
+                return True
+        return False
+    
+    async def initialize(self):
+        """Create the indexes the alert write path relies on.
+        
+        Failures are logged rather than raised so the API keeps serving; the
+        upserts still deduplicate without the unique index, just less strictly.
+        """
+        try:
+            # Alerts are deduplicated by Mongo rather than a find_one per post
+            await self.db.threat_alerts.create_index(
+                [("post_id", 1), ("platform", 1)], unique=True
+            )
+            # Keep per-platform and per-level counts cheap on a cache miss
+            await self.db.threat_alerts.create_index("platform")
+            await self.db.threat_alerts.create_index("threat_level")
+            self._indexes_ready = True
+        except DuplicateKeyError as e:
+            self.logger.error(
+                "Cannot create unique (post_id, platform) index; remove duplicate alerts first: %s", e
+            )
+        except (OperationFailure, ServerSelectionTimeoutError) as e:
+            self.logger.error("Could not create threat alert indexes: %s", e)
+        
     def _generate_mock_posts(self) -> List[Dict]:
         """Generate realistic mock social media posts for demonstration"""
         
+        now = datetime.now(timezone.utc)
+        
         # Mix of normal, concerning, and threatening posts
         mock_posts = [
             # Benign posts
@@ -34,7 +117,7 @@ class SocialMediaMonitor:
                 "content": f"Love {self.vip_target}! Can't wait for the next movie!",
                 "url": "https://twitter.com/fan_user_1/status/123456789",
                 "images": [],
-                "timestamp": datetime.now(timezone.utc)
+                "timestamp": now
             },
             {
                 "platform": "Instagram",
@@ -42,7 +125,7 @@ class SocialMediaMonitor:
                 "content": f"Just watched {self.vip_target}'s latest film. Amazing performance! 🎬",
                 "url": "https://instagram.com/p/abc123def/",
                 "images": ["https://example.com/image1.jpg"],
-                "timestamp": datetime.now(timezone.utc)
+                "timestamp": now
             },
             
             # Negative sentiment posts
@@ -52,7 +135,7 @@ class SocialMediaMonitor:
                 "content": f"I really hate {self.vip_target}'s new movie. Worst acting ever!",
                 "url": "https://twitter.com/critic_user/status/234567890",
                 "images": [],
-                "timestamp": datetime.now(timezone.utc)
+                "timestamp": now
             },
             {
                 "platform": "Facebook",
@@ -60,7 +143,7 @@ class SocialMediaMonitor:
                 "content": f"{self.vip_target} is so overrated. Terrible performance in everything.",
                 "url": "https://facebook.com/posts/567890123",
                 "images": [],
-                "timestamp": datetime.now(timezone.utc)
+                "timestamp": now
             },
             
             # Suspicious/bot accounts
@@ -70,7 +153,7 @@ class SocialMediaMonitor:
                 "content": f"{self.vip_target} should just quit acting. Nobody likes them anymore.",
                 "url": "https://twitter.com/bot_user_123/status/345678901",
                 "images": [],
-                "timestamp": datetime.now(timezone.utc)
+                "timestamp": now
             },
             {
                 "platform": "Instagram",
@@ -78,7 +161,7 @@ class SocialMediaMonitor:
                 "content": f"Why does {self.vip_target} even exist? So annoying!",
                 "url": "https://instagram.com/p/def456ghi/",
                 "images": [],
-                "timestamp": datetime.now(timezone.utc)
+                "timestamp": now
             },
             
             # Threatening/concerning posts
@@ -88,7 +171,7 @@ class SocialMediaMonitor:
                 "content": f"{self.vip_target} deserves to be hurt for what they did. Someone should teach them a lesson.",
                 "url": "https://twitter.com/angry_user_789/status/456789012",
                 "images": [],
-                "timestamp": datetime.now(timezone.utc)
+                "timestamp": now
             },
             {
                 "platform": "Facebook",
@@ -96,7 +179,7 @@ class SocialMediaMonitor:
                 "content": f"I'm going to find {self.vip_target} and make them pay. They won't get away with this.",
                 "url": "https://facebook.com/posts/789012345",
                 "images": [],
-                "timestamp": datetime.now(timezone.utc)
+                "timestamp": now
             },
             {
                 "platform": "Instagram",
@@ -104,7 +187,7 @@ class SocialMediaMonitor:
                 "content": f"{self.vip_target} should die. The world would be better without them. I'll make sure of it.",
                 "url": "https://instagram.com/p/ghi789jkl/",
                 "images": [],
-                "timestamp": datetime.now(timezone.utc)
+                "timestamp": now
             },
             
             # Misinformation/impersonation
@@ -114,7 +197,7 @@ class SocialMediaMonitor:
                 "content": "I'm retiring from acting effective immediately. Thank you for all the support over the years.",
                 "url": "https://twitter.com/fake_celebrity/status/567890123",
                 "images": [],
-                "timestamp": datetime.now(timezone.utc)
+                "timestamp": now
             }
         ]
         
@@ -125,12 +208,22 @@ class SocialMediaMonitor:
         self.is_monitoring = True
         self.logger.info("Starting social media monitoring...")
         
+        flush_task = None
         try:
+            if not self._indexes_ready:
+                await self.initialize()
+            self.threat_engine = await get_engine()
+            flush_task = asyncio.create_task(self._flush_alerts_periodically())
+            
             while self.is_monitoring:
-                # Monitor each platform
-                await self._monitor_twitter()
-                await self._monitor_facebook()
-                await self._monitor_instagram()
+                self._tick_time = datetime.now(timezone.utc)
+                
+                # Monitor all platforms concurrently
+                await asyncio.gather(
+                    self._monitor_twitter(),
+                    self._monitor_facebook(),
+                    self._monitor_instagram()
+                )
                 
                 # Wait before next monitoring cycle (30 seconds for demo)
                 await asyncio.sleep(30)
@@ -139,8 +232,17 @@ class SocialMediaMonitor:
             self.logger.info("Monitoring cancelled")
             self.is_monitoring = False
         except Exception as e:
-            self.logger.error(f"Error in monitoring loop: {e}")
+            self.logger.error("Error in monitoring loop: %s", e)
             self.is_monitoring = False
+        finally:
+            if flush_task:
+                # is_monitoring is False here, so the flusher exits after finishing any
+                # in-flight bulk write; cancelling it could drop a batch already taken
+                # from the buffer
+                self.is_monitoring = False
+                await flush_task
+            # Write out anything still buffered
+            await self._flush_alerts()
     
     async def stop_monitoring(self):
         """Stop the monitoring process"""
@@ -152,55 +254,35 @@ class SocialMediaMonitor:
         try:
             # In a real implementation, this would use the Twitter API
             # For demonstration, we'll use mock data
-            twitter_posts = [post for post in self.mock_posts if post["platform"] == "Twitter"]
-            
-            # Randomly select a post to "discover" (simulate real-time monitoring)
-            if twitter_posts and random.random() < 0.3:  # 30% chance to find a post
-                post = random.choice(twitter_posts)
-                await self._process_post(post)
+            await self._process_post(next(self._feeds["Twitter"]))
                 
         except Exception as e:
-            self.logger.error(f"Error monitoring Twitter: {e}")
+            self.logger.error("Error monitoring Twitter: %s", e)
     
     async def _monitor_facebook(self):
         """Monitor Facebook for threats"""
         try:
             # In a real implementation, this would use Facebook Graph API or scraping
-            facebook_posts = [post for post in self.mock_posts if post["platform"] == "Facebook"]
-            
-            # Randomly select a post to "discover"
-            if facebook_posts and random.random() < 0.2:  # 20% chance to find a post
-                post = random.choice(facebook_posts)
-                await self._process_post(post)
+            await self._process_post(next(self._feeds["Facebook"]))
                 
         except Exception as e:
-            self.logger.error(f"Error monitoring Facebook: {e}")
+            self.logger.error("Error monitoring Facebook: %s", e)
     
     async def _monitor_instagram(self):
         """Monitor Instagram for threats"""
         try:
             # In a real implementation, this would use Instagram API or scraping
-            instagram_posts = [post for post in self.mock_posts if post["platform"] == "Instagram"]
-            
-            # Randomly select a post to "discover"
-            if instagram_posts and random.random() < 0.25:  # 25% chance to find a post
-                post = random.choice(instagram_posts)
-                await self._process_post(post)
+            await self._process_post(next(self._feeds["Instagram"]))
                 
         except Exception as e:
-            self.logger.error(f"Error monitoring Instagram: {e}")
+            self.logger.error("Error monitoring Instagram: %s", e)
     
     async def _process_post(self, post: Dict):
         """Process a social media post for threats"""
         try:
-            # Check if we've already processed this post
-            existing_alert = await self.db.threat_alerts.find_one({
-                "post_id": post.get("url", "").split("/")[-1],
-                "platform": post["platform"]
-            })
-            
-            if existing_alert:
-                return  # Already processed
+            # Ignore posts that don't concern the monitored VIP
+            if not self._mentions_vip(post):
+                return
             
             # Analyze the post for threats
             analysis_result = await self.threat_engine.analyze_post(
@@ -216,7 +298,7 @@ class SocialMediaMonitor:
                 await self._create_threat_alert(post, analysis_result)
                 
         except Exception as e:
-            self.logger.error(f"Error processing post: {e}")
+            self.logger.error("Error processing post: %s", e)
     
     async def _create_threat_alert(self, post: Dict, analysis: Dict):
         """Create and store a threat alert"""
@@ -233,36 +315,95 @@ class SocialMediaMonitor:
                 "platform": post["platform"],
                 "reason": ", ".join(analysis["reasons"]) if analysis["reasons"] else "General Concern",
                 "score": analysis["overall_score"],
-                "timestamp": datetime.now(timezone.utc),
+                "timestamp": self._tick_time,
                 "ai_analysis": analysis["ai_analysis"],
                 "threat_level": analysis["threat_level"]
             }
             
-            # Store in database
-            await self.db.threat_alerts.insert_one(alert_data)
-            
-            self.logger.info(f"Created threat alert for {post['platform']} post by {post['author']}")
-            self.logger.info(f"Threat level: {analysis['threat_level']}, Score: {analysis['overall_score']:.2f}")
+            # Queue for the next bulk write
+            async with self._alert_lock:
+                self._alert_buffer.append(alert_data)
             
         except Exception as e:
-            self.logger.error(f"Error creating threat alert: {e}")
+            self.logger.error("Error creating threat alert: %s", e)
+    
+    async def _flush_alerts_periodically(self):
+        """Flush buffered alerts on a fixed interval while monitoring runs"""
+        while self.is_monitoring:
+            await asyncio.sleep(self._flush_interval)
+            await self._flush_alerts()
+    
+    async def _flush_alerts(self):
+        """Write all buffered alerts to the database in a single bulk operation"""
+        async with self._alert_lock:
+            batch, self._alert_buffer = self._alert_buffer, []
+        
+        if not batch:
+            return
+        
+        # The unique (post_id, platform) index makes each upsert a no-op for known posts
+        operations = [
+            UpdateOne(
+                {"post_id": alert["post_id"], "platform": alert["platform"]},
+                {"$setOnInsert": alert},
+                upsert=True
+            )
+            for alert in batch
+        ]
+        
+        try:
+            result = await self.db.threat_alerts.bulk_write(operations, ordered=False)
+            upserted = result.upserted_ids.keys()
+        except BulkWriteError as e:
+            # Duplicate keys from concurrent upserts are expected; the rest still applied
+            upserted = [entry["index"] for entry in e.details.get("upserted", [])]
+            errors = [err for err in e.details.get("writeErrors", []) if err.get("code") != 11000]
+            if errors:
+                self.logger.error("Error writing %d threat alerts: %s", len(errors), errors[0].get('errmsg'))
+        except Exception as e:
+            self.logger.error("Error writing threat alerts: %s", e)
+            return
+        
+        if upserted:
+            self.invalidate_alert_counts()
+        
+        for index in upserted:
+            alert = batch[index]
+            self.logger.info("Created threat alert for %s post by %s", alert['platform'], alert['author'])
+            self.logger.info("Threat level: %s, Score: %.2f", alert['threat_level'], alert['score'])
+    
+    async def count_alerts(self, field: str = None, value: str = None) -> int:
+        """Count alerts, optionally filtered by one field, serving repeats from a short TTL cache"""
+        key = f"{field}:{value}" if field else "total"
+        cached = self._counts_cache.get(key)
+        now = time.monotonic()
+        
+        if cached and cached[1] > now:
+            return cached[0]
+        
+        query = {field: value} if field else {}
+        count = await self.db.threat_alerts.count_documents(query)
+        self._counts_cache[key] = (count, now + self._counts_ttl)
+        return count
+    
+    def invalidate_alert_counts(self):
+        """Drop cached counts after alerts are written or deleted"""
+        self._counts_cache.clear()
     
     async def get_monitoring_stats(self) -> Dict:
         """Get monitoring statistics"""
         try:
-            total_alerts = await self.db.threat_alerts.count_documents({})
+            total_alerts = await self.count_alerts()
             
             # Get alerts by platform
             platform_stats = {}
             for platform in ["Twitter", "Facebook", "Instagram"]:
-                count = await self.db.threat_alerts.count_documents({"platform": platform})
-                platform_stats[platform] = count
+                platform_stats[platform] = await self.count_alerts("platform", platform)
             
             # Get alerts by threat level
             threat_level_stats = {}
             for level in ["low", "medium", "high", "critical"]:
-                count = await self.db.threat_alerts.count_documents({"threat_level": level})
-                threat_level_stats[level] = count
+                threat_level_stats[level] = await self.count_alerts("threat_level", level)
             
             return {
                 "total_alerts": total_alerts,
@@ -272,5 +413,5 @@ class SocialMediaMonitor:
             }
             
         except Exception as e:
-            self.logger.error(f"Error getting monitoring stats: {e}")
+            self.logger.error("Error getting monitoring stats: %s", e)
             return {}
\ No newline at end of file
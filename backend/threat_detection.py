@@ -1,34 +1,344 @@
 import os
+import re
+import socket
 import asyncio
+import functools
+import hashlib
+import ipaddress
 import logging
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, List
-from transformers import pipeline
+from typing import Dict, List, Optional
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
 import torch
 #from emergentintegrations.llm.chat import LlmChat, UserMessage   
 from dotenv import load_dotenv
-import imagehash
+import aiohttp
+from yarl import URL
+import numpy as np
+import scipy.fft
 from PIL import Image
-import requests
 from io import BytesIO
+import ahocorasick
 
 load_dotenv()
 
 
+def is_public_address(address: str) -> bool:
+    """True if the IP address is globally routable (not private, loopback, link-local, etc.)"""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+class PublicAddressResolver(aiohttp.ThreadedResolver):
+    """Resolver that refuses hosts with any non-public address.
+
+    Checking here, rather than before the request, means the connection uses
+    exactly the addresses that were validated (no DNS rebinding window).
+    """
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET):
+        results = await super().resolve(host, port, family)
+        for result in results:
+            if not is_public_address(result["host"]):
+                raise OSError(f"{host} resolves to non-public address {result['host']}")
+        return results
+
+
+class InferenceBatcher:
+    """Coalesce concurrent single-text requests into batched classifier calls"""
+
+    def __init__(self, classifier, max_batch_size: int = 32, max_wait_ms: float = 10.0,
+                 executor: Optional[Executor] = None):
+        self.logger = logging.getLogger(__name__)
+        self.classifier = classifier
+        # Without an explicit executor the batcher runs forwards on its own single thread, so
+        # per-thread model state (e.g. CUDA graphs) is built once and the models don't
+        # compete for the same pool
+        self.executor = executor
+        self._owns_executor = executor is None
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker = None
+
+    def start(self):
+        """Start the background worker that drains the queue"""
+        if self._owns_executor and self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background worker and release its thread"""
+        if self._worker and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def submit(self, text: str) -> Dict:
+        """Queue a single text and wait for its classification result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect_batch(self) -> List:
+        """Wait for one item, then gather more until the batch is full or the window closes"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            texts = [text for text, _ in batch]
+
+            try:
+                # Run the forward pass off the event loop so other posts keep flowing
+                results = await loop.run_in_executor(
+                    self.executor, functools.partial(self.classifier, texts, batch_size=len(texts), truncation=True)
+                )
+            except Exception as e:
+                self.logger.error("Batched inference error: %s", e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class TransformerClassifier:
+    """Fast tokenizer + sequence classification model with a pipeline-style batched call"""
+
+    def __init__(self, model_name: str, device: str, max_length: int = 256):
+        self.logger = logging.getLogger(__name__)
+        self.device = device
+        self.max_length = max_length
+        # Set by compile(): pad sequence lengths up to a multiple of this, and
+        # batch sizes up to the next power of two
+        self.pad_to_multiple_of = None
+        self.pad_batch = False
+        # Uncompiled model kept by compile() so a failing compiled graph can be dropped
+        self._eager_model = None
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name).to(device).eval()
+        # Dedicated CUDA stream per model; None on CPU
+        self.stream = None
+        if device == "cuda":
+            self.model = self.model.half()
+            self.stream = torch.cuda.Stream()
+
+        config = self.model.config
+        self.id2label = {index: label.upper() for index, label in config.id2label.items()}
+        self.multi_label = config.problem_type == "multi_label_classification"
+
+    def __call__(self, texts: List[str], batch_size: int = None, truncation: bool = True) -> List[Dict]:
+        """Return the top label and its probability for each text"""
+        try:
+            return self._classify(texts, truncation)
+        except Exception as e:
+            if self._eager_model is None:
+                raise
+            # Compilation is lazy, so its errors only show up on a forward pass
+            self.logger.warning("Compiled model failed, falling back to eager mode: %s", e)
+            self._restore_eager()
+            return self._classify(texts, truncation)
+
+    def _classify(self, texts: List[str], truncation: bool) -> List[Dict]:
+        count = len(texts)
+        if self.pad_batch:
+            # Filler rows keep the batch dimension on a few fixed sizes; dropped below
+            texts = list(texts) + [""] * ((1 << (count - 1).bit_length()) - count)
+
+        encoded = self.tokenizer(
+            texts, padding=True, truncation=truncation, max_length=self.max_length,
+            pad_to_multiple_of=self.pad_to_multiple_of, return_tensors="pt"
+        )
+
+        if self.stream is None:
+            with torch.inference_mode():
+                indices, scores = self._forward(encoded.to(self.device))
+        else:
+            # Copy from page-locked memory on this model's own stream so the transfer is
+            # asynchronous. Each classifier is called from its batcher's dedicated thread,
+            # so this overlaps with the other classifier's forward pass
+            with torch.cuda.stream(self.stream), torch.inference_mode():
+                encoded = {
+                    name: tensor.pin_memory().to(self.device, non_blocking=True)
+                    for name, tensor in encoded.items()
+                }
+                indices, scores = self._forward(encoded)
+
+        return [
+            {"label": self.id2label[index], "score": score}
+            for index, score in zip(indices[:count], scores[:count])
+        ]
+
+    def _forward(self, encoded) -> tuple:
+        """Run the model and read back (label indices, scores) on the current stream"""
+        logits = self.model(**encoded).logits
+        probs = torch.sigmoid(logits) if self.multi_label else torch.softmax(logits, dim=-1)
+        scores, indices = probs.float().max(dim=-1)
+        return indices.cpu().tolist(), scores.cpu().tolist()
+
+    def compile(self, pad_to_multiple_of: int = 64):
+        """Compile the model with TorchInductor.
+
+        Batch sizes are padded to powers of two and sequence lengths to multiples of
+        pad_to_multiple_of, so the compiled graphs and CUDA graphs are reused across
+        batches instead of re-recorded for every new (batch, length) shape.
+        """
+        compiled = torch.compile(self.model, mode="reduce-overhead")
+        self._eager_model, self.model = self.model, compiled
+        self.pad_to_multiple_of = pad_to_multiple_of
+        self.pad_batch = True
+
+        # Warm up so compile errors surface now (and fall back) instead of on the first post
+        self(["warm-up"])
+
+    def _restore_eager(self):
+        self.model = self._eager_model
+        self._eager_model = None
+        self.pad_to_multiple_of = None
+        self.pad_batch = False
+
+
 class ThreatDetectionEngine:
+    SUSPICIOUS_PATTERNS = (
+        "bot", "fake", "spam", "_123", "random", "temp",
+        "user123", "account123", "profile123"
+    )
+    THREAT_KEYWORDS = ("kill", "murder", "die", "hurt", "harm", "attack", "destroy")
+    NEGATIVE_KEYWORDS = ("hate", "awful", "terrible", "disgusting", "worst")
+    # Clearly positive wording; only posts containing one of these may skip the transformers
+    BENIGN_KEYWORDS = (
+        "love", "loved", "amazing", "awesome", "great", "brilliant", "beautiful",
+        "congrats", "congratulations", "can't wait", "favorite", "favourite", "proud"
+    )
+    # Weight of each detector in the overall threat score
+    SCORE_WEIGHTS = (
+        ("toxicity", 0.3),
+        ("sentiment", 0.1),
+        ("fake_account", 0.2),
+        ("image_misuse", 0.15),
+        ("llm_confidence", 0.25),
+    )
+    # Number of distinct post contents whose model outputs are kept
+    CONTENT_CACHE_SIZE = 10_000
+    # Number of distinct (platform, author) account verdicts that are kept
+    AUTHOR_CACHE_SIZE = 4_096
+    # Images larger than this are not downloaded for hashing
+    MAX_IMAGE_BYTES = 10 * 1024 * 1024
+    # Images fetched per post; the URLs can come from API clients
+    MAX_IMAGE_URLS = 8
+    # Max Hamming distance (bits) between 64-bit pHashes to count as the same image
+    IMAGE_HASH_MAX_DISTANCE = 5
+    # Official hashes compared per slice when matching an image
+    OFFICIAL_HASH_SCAN_CHUNK = 1 << 20
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
 
+        # All keyword lists share one Aho-Corasick automaton, so any text is
+        # classified against every list in a single pass. Input must be lower-case.
+        self._keyword_automaton = self._build_keyword_automaton({
+            "toxic": self.THREAT_KEYWORDS,
+            "negative": self.NEGATIVE_KEYWORDS,
+            "fake": self.SUSPICIOUS_PATTERNS,
+            "benign": self.BENIGN_KEYWORDS,
+        })
+        # Normalization used to collapse near-duplicate reposts in the content cache
+        self._url_pattern = re.compile(r"https?://\S+")
+        self._punct_pattern = re.compile(r"[^\w\s]+")
+
         # HuggingFace Models
         self.toxic_classifier = None
         self.sentiment_analyzer = None
 
+        # Micro-batching front-ends for the classifiers (started in initialize)
+        self._toxic_batcher = None
+        self._sentiment_batcher = None
+
+        # LRU of (toxicity, sentiment) results keyed by exact and normalized content hash
+        self._content_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        # LRU of fake-account verdicts; the same accounts post repeatedly
+        self._author_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+
         # LLM Chat for advanced analysis (disabled placeholder)
         self.llm_chat = None
 
-        # Official image hashes for comparison (placeholder)
-        self.official_image_hashes = set()
+        # Official image pHashes packed as uint64 (loaded in initialize)
+        self._official_hashes_u64 = np.empty(0, dtype=np.uint64)
+        self.image_hash_max_distance = int(
+            os.environ.get("IMAGE_HASH_MAX_DISTANCE", self.IMAGE_HASH_MAX_DISTANCE)
+        )
+
+        # Opt-in: let clearly positive posts from clean authors skip the transformers
+        self.skip_benign_inference = os.environ.get("SKIP_BENIGN_INFERENCE", "false").lower() == "true"
+
+        # Shared HTTP client for image downloads (opened in initialize)
+        self._http = None
+
+        # Bounded pool for image decoding/hashing (created in initialize); each
+        # batcher drives its model from its own dedicated thread
+        self._cpu_pool = None
+
+    @staticmethod
+    def _build_keyword_automaton(keyword_lists: Dict[str, tuple]) -> ahocorasick.Automaton:
+        """Compile category -> keywords into one automaton whose values are (length, category set)"""
+        automaton = ahocorasick.Automaton()
+        for category, keywords in keyword_lists.items():
+            for keyword in keywords:
+                _, categories = automaton.get(keyword, (len(keyword), frozenset()))
+                automaton.add_word(keyword, (len(keyword), categories | {category}))
+        automaton.make_automaton()
+        return automaton
+
+    def _scan_keywords(self, text_lc: str, whole_words: bool = False) -> set:
+        """Return the keyword categories found in lower-cased text.
+
+        With whole_words, hits inside a longer word ("die" in "diet") are ignored.
+        """
+        found = set()
+        for end, (length, categories) in self._keyword_automaton.iter(text_lc):
+            if whole_words:
+                start = end - length + 1
+                if start > 0 and text_lc[start - 1].isalnum():
+                    continue
+                if end + 1 < len(text_lc) and text_lc[end + 1].isalnum():
+                    continue
+            found |= categories
+        return found
 
     async def initialize(self):
         """Initialize all models and components"""
@@ -38,54 +348,135 @@ class ThreatDetectionEngine:
             # Initialize HuggingFace models
             await self._initialize_huggingface_models()
 
+            # Image decoding and hashing run here instead of on the event loop
+            self._cpu_pool = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("CPU_POOL_WORKERS", os.cpu_count() or 1)),
+                thread_name_prefix="threat-cpu"
+            )
+
+            # Start micro-batching workers for the classifiers
+            self._start_batchers()
+
             # Skip LLM initialization since module is missing
             self.llm_chat = None
 
             # Load official image hashes
             self._load_official_image_hashes()
 
+            # Pooled HTTP client reused across posts
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, resolver=PublicAddressResolver()),
+                timeout=aiohttp.ClientTimeout(total=10, connect=3)
+            )
+
             self.logger.info("Threat detection engine initialized successfully")
 
         except Exception as e:
-            self.logger.error(f"Failed to initialize threat detection engine: {e}")
+            self.logger.error("Failed to initialize threat detection engine: %s", e)
             raise
 
+    async def close(self):
+        """Stop background workers and release network resources"""
+        for batcher in (self._toxic_batcher, self._sentiment_batcher):
+            if batcher:
+                await batcher.stop()
+
+        if self._http and not self._http.closed:
+            await self._http.close()
+
+        if self._cpu_pool:
+            self._cpu_pool.shutdown(wait=False, cancel_futures=True)
+            self._cpu_pool = None
+
     async def _initialize_huggingface_models(self):
         """Initialize HuggingFace models for toxicity and sentiment analysis"""
         try:
-            self.toxic_classifier = pipeline(
-                "text-classification",
-                model="unitary/toxic-bert",
-                device=0 if self.device == "cuda" else -1
-            )
-
-            self.sentiment_analyzer = pipeline(
-                "sentiment-analysis",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                device=0 if self.device == "cuda" else -1
-            )
-
+            # Downloading, loading and quantizing take seconds to minutes; keep them off the event loop
+            await asyncio.to_thread(self._load_huggingface_models)
             self.logger.info("HuggingFace models loaded successfully")
 
         except Exception as e:
-            self.logger.error(f"Failed to initialize HuggingFace models: {e}")
+            self.logger.error("Failed to initialize HuggingFace models: %s", e)
             # fallback
             self.toxic_classifier = self._mock_toxic_classifier
             self.sentiment_analyzer = self._mock_sentiment_analyzer
 
+    def _load_huggingface_models(self):
+        """Blocking part of model initialization, run in a worker thread"""
+        if self.device == "cpu":
+            torch.set_num_threads(os.cpu_count() or 1)
+
+        self.toxic_classifier = TransformerClassifier("unitary/toxic-bert", self.device)
+
+        self.sentiment_analyzer = TransformerClassifier(
+            "cardiffnlp/twitter-roberta-base-sentiment-latest", self.device
+        )
+
+        if self.device == "cpu":
+            if os.environ.get("QUANTIZE_CPU_MODELS", "true").lower() == "true":
+                # Dynamic INT8 quantization of the Linear layers for CPU inference;
+                # best effort, the fp32 model is kept if it fails
+                for classifier in (self.toxic_classifier, self.sentiment_analyzer):
+                    try:
+                        classifier.model = torch.ao.quantization.quantize_dynamic(
+                            classifier.model, {torch.nn.Linear}, dtype=torch.qint8
+                        )
+                    except Exception as e:
+                        self.logger.warning("INT8 quantization failed, keeping fp32 model: %s", e)
+        elif hasattr(torch, "compile"):
+            # Fuse attention/MLP kernels with TorchInductor on GPU; best effort, like quantization
+            for classifier in (self.toxic_classifier, self.sentiment_analyzer):
+                try:
+                    classifier.compile()
+                except Exception as e:
+                    self.logger.warning("torch.compile failed, keeping eager model: %s", e)
+
+    def _start_batchers(self):
+        """Wrap the classifiers in batchers so concurrent posts share one forward pass"""
+        max_batch_size = int(os.environ.get("INFERENCE_MAX_BATCH_SIZE", "32"))
+        max_wait_ms = float(os.environ.get("INFERENCE_MAX_WAIT_MS", "10"))
+
+        if self.toxic_classifier is not None:
+            self._toxic_batcher = InferenceBatcher(
+                self.toxic_classifier, max_batch_size, max_wait_ms
+            )
+            self._toxic_batcher.start()
+
+        if self.sentiment_analyzer is not None:
+            self._sentiment_batcher = InferenceBatcher(
+                self.sentiment_analyzer, max_batch_size, max_wait_ms
+            )
+            self._sentiment_batcher.start()
+
     def _load_official_image_hashes(self):
         """Load official image hashes for misuse detection"""
-        placeholder_hashes = [
-            "a1b2c3d4e5f6g7h8",  # Example hash
-            "h8g7f6e5d4c3b2a1",  # Example hash
-        ]
-        self.official_image_hashes = set(placeholder_hashes)
-        self.logger.info(f"Loaded {len(self.official_image_hashes)} official image hashes")
+        hashes_path = os.environ.get(
+            "OFFICIAL_HASHES_PATH", os.path.join(os.path.dirname(__file__), "official_hashes.npy")
+        )
+
+        if os.path.exists(hashes_path):
+            # Contiguous uint64 array, paged in lazily and shared across worker processes
+            self._official_hashes_u64 = np.load(hashes_path, mmap_mode="r")
+            if self._official_hashes_u64.dtype != np.uint64:
+                raise ValueError(f"{hashes_path} must hold uint64 hashes, got {self._official_hashes_u64.dtype}")
+            if self._official_hashes_u64.ndim != 1:
+                raise ValueError(f"{hashes_path} must be a 1-D array, got shape {self._official_hashes_u64.shape}")
+        else:
+            placeholder_hashes = [
+                "a1b2c3d4e5f6a7b8",  # Example hash
+                "b8a7f6e5d4c3b2a1",  # Example hash
+            ]
+            # Packed as uint64 so a query is one vectorized XOR + popcount
+            self._official_hashes_u64 = np.array([int(h, 16) for h in placeholder_hashes], dtype=np.uint64)
+
+        self.logger.info("Loaded %d official image hashes", self._official_hashes_u64.size)
 
     async def analyze_post(self, content: str, author: str, platform: str,
                            post_url: str = "", image_urls: List[str] = None) -> Dict:
         """Comprehensive threat analysis of a social media post"""
         try:
+            author_lc = author.lower()
+
             analysis_results = {
                 "is_threat": False,
                 "threat_level": "low",
@@ -95,31 +486,51 @@ class ThreatDetectionEngine:
                 "overall_score": 0.0
             }
 
-            # Toxicity
-            toxicity_result = await self._analyze_toxicity(content)
-            analysis_results["scores"]["toxicity"] = toxicity_result["score"]
+            # Cheap checks first; they decide whether the transformers need to run
+            fake_account_result = self._analyze_fake_account(author_lc, platform)
+            content_lc = content.lower()
+            # Substring matches so inflections ("killing", "hated") still reach the models
+            content_categories = self._scan_keywords(content_lc)
+            # Whole words so "love" inside "glove" is not taken as a benign signal
+            looks_benign = "benign" in self._scan_keywords(content_lc, whole_words=True)
+            needs_inference = (
+                not self.skip_benign_inference
+                or fake_account_result["score"] >= 0.3
+                or bool(image_urls)
+                or "toxic" in content_categories
+                or "negative" in content_categories
+                or not looks_benign
+            )
+
+            # Start image downloads now so they overlap with model inference
+            image_task = asyncio.create_task(self._analyze_image_misuse(image_urls)) if image_urls else None
+
+            # When skipped, toxicity and sentiment are left out of the scores (not reported as 0.0)
+            if needs_inference:
+                toxicity_result, sentiment_result = await self._analyze_content(content)
 
-            if toxicity_result["is_toxic"]:
-                analysis_results["is_threat"] = True
-                analysis_results["reasons"].append("Violence & Threat Detection")
+                # Toxicity
+                analysis_results["scores"]["toxicity"] = toxicity_result["score"]
 
-            # Sentiment
-            sentiment_result = await self._analyze_sentiment(content)
-            analysis_results["scores"]["sentiment"] = sentiment_result["score"]
+                if toxicity_result["is_toxic"]:
+                    analysis_results["is_threat"] = True
+                    analysis_results["reasons"].append("Violence & Threat Detection")
 
-            if sentiment_result["is_negative"]:
-                analysis_results["reasons"].append("Negative Sentiment")
+                # Sentiment
+                analysis_results["scores"]["sentiment"] = sentiment_result["score"]
+
+                if sentiment_result["is_negative"]:
+                    analysis_results["reasons"].append("Negative Sentiment")
 
             # Fake account
-            fake_account_result = await self._analyze_fake_account(author, platform)
             analysis_results["scores"]["fake_account"] = fake_account_result["score"]
 
             if fake_account_result["is_suspicious"]:
                 analysis_results["reasons"].append("Suspicious Account")
 
             # Image misuse
-            if image_urls:
-                image_result = await self._analyze_image_misuse(image_urls)
+            if image_task:
+                image_result = await image_task
                 analysis_results["scores"]["image_misuse"] = image_result["score"]
 
                 if image_result["is_misuse"]:
@@ -147,7 +558,7 @@ class ThreatDetectionEngine:
             return analysis_results
 
         except Exception as e:
-            self.logger.error(f"Error analyzing post: {e}")
+            self.logger.error("Error analyzing post: %s", e)
             return {
                 "is_threat": False,
                 "threat_level": "low",
@@ -157,115 +568,244 @@ class ThreatDetectionEngine:
                 "overall_score": 0.0
             }
 
+    @staticmethod
+    def _content_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def _normalize_content(self, content: str) -> str:
+        """Lower-case and strip URLs and punctuation so trivial repost edits share a key"""
+        text = self._url_pattern.sub(" ", content.lower())
+        text = self._punct_pattern.sub(" ", text)
+        return " ".join(text.split())
+
+    def _cache_content_result(self, key: bytes, result: tuple):
+        self._content_cache[key] = result
+        self._content_cache.move_to_end(key)
+        if len(self._content_cache) > self.CONTENT_CACHE_SIZE:
+            self._content_cache.popitem(last=False)
+
+    async def _analyze_content(self, content: str) -> tuple:
+        """Run the content classifiers, reusing results for previously seen content"""
+        exact_key = self._content_key(content)
+        cached = self._content_cache.get(exact_key)
+        if cached is not None:
+            self._content_cache.move_to_end(exact_key)
+            return cached
+
+        # Near-duplicate lookup (case, punctuation or link changes only)
+        normalized_key = self._content_key(self._normalize_content(content))
+        cached = self._content_cache.get(normalized_key)
+        if cached is not None:
+            self._cache_content_result(normalized_key, cached)
+            self._cache_content_result(exact_key, cached)
+            return cached
+
+        toxicity_result, sentiment_result = await asyncio.gather(
+            self._analyze_toxicity(content), self._analyze_sentiment(content)
+        )
+        result = (toxicity_result, sentiment_result)
+
+        # Don't cache failures so the post is retried next time
+        if toxicity_result["label"] != "ERROR" and sentiment_result["label"] != "ERROR":
+            self._cache_content_result(normalized_key, result)
+            self._cache_content_result(exact_key, result)
+
+        return result
+
     async def _analyze_toxicity(self, content: str) -> Dict:
         try:
-            result = self.toxic_classifier(content) if callable(self.toxic_classifier) else [
-                {"label": "TOXIC", "score": 0.3}
-            ]
+            result = await self._toxic_batcher.submit(content) if self._toxic_batcher else {
+                "label": "TOXIC", "score": 0.3
+            }
 
-            is_toxic = result[0]["label"] == "TOXIC" and result[0]["score"] > 0.7
+            is_toxic = result["label"] == "TOXIC" and result["score"] > 0.7
 
             return {
                 "is_toxic": is_toxic,
-                "score": result[0]["score"] if result[0]["label"] == "TOXIC" else 1 - result[0]["score"],
-                "label": result[0]["label"]
+                "score": result["score"] if result["label"] == "TOXIC" else 1 - result["score"],
+                "label": result["label"]
             }
 
         except Exception as e:
-            self.logger.error(f"Toxicity analysis error: {e}")
+            self.logger.error("Toxicity analysis error: %s", e)
             return {"is_toxic": False, "score": 0.0, "label": "ERROR"}
 
     async def _analyze_sentiment(self, content: str) -> Dict:
         try:
-            result = self.sentiment_analyzer(content) if callable(self.sentiment_analyzer) else [
-                {"label": "NEGATIVE", "score": 0.4}
-            ]
+            result = await self._sentiment_batcher.submit(content) if self._sentiment_batcher else {
+                "label": "NEGATIVE", "score": 0.4
+            }
 
-            is_negative = result[0]["label"] == "NEGATIVE" and result[0]["score"] > 0.6
+            is_negative = result["label"] == "NEGATIVE" and result["score"] > 0.6
 
             return {
                 "is_negative": is_negative,
-                "score": result[0]["score"],
-                "label": result[0]["label"]
+                "score": result["score"],
+                "label": result["label"]
             }
 
         except Exception as e:
-            self.logger.error(f"Sentiment analysis error: {e}")
+            self.logger.error("Sentiment analysis error: %s", e)
             return {"is_negative": False, "score": 0.0, "label": "ERROR"}
 
-    async def _analyze_fake_account(self, author: str, platform: str) -> Dict:
+    def _analyze_fake_account(self, author_lc: str, platform: str) -> Dict:
         try:
-            suspicious_patterns = [
-                "bot", "fake", "spam", "_123", "random", "temp",
-                "user123", "account123", "profile123"
-            ]
-            is_suspicious = any(pattern in author.lower() for pattern in suspicious_patterns)
+            key = (platform, author_lc)
+            cached = self._author_cache.get(key)
+            if cached is not None:
+                self._author_cache.move_to_end(key)
+                return cached
+
+            is_suspicious = "fake" in self._scan_keywords(author_lc)
             score = 0.8 if is_suspicious else 0.2
 
-            return {
+            result = {
                 "is_suspicious": is_suspicious,
                 "score": score,
                 "reasons": ["Suspicious username pattern"] if is_suspicious else []
             }
 
+            self._author_cache[key] = result
+            if len(self._author_cache) > self.AUTHOR_CACHE_SIZE:
+                self._author_cache.popitem(last=False)
+
+            return result
+
         except Exception as e:
-            self.logger.error(f"Fake account analysis error: {e}")
+            self.logger.error("Fake account analysis error: %s", e)
             return {"is_suspicious": False, "score": 0.0, "reasons": []}
 
     async def _analyze_image_misuse(self, image_urls: List[str]) -> Dict:
         try:
-            misuse_detected = False
-            misuse_score = 0.0
-
-            for url in image_urls:
-                try:
-                    mock_hash = "a1b2c3d4e5f6g7h8"
-                    if mock_hash in self.official_image_hashes:
-                        misuse_detected = True
-                        misuse_score = 0.9
-                        break
-                except Exception as img_error:
-                    self.logger.error(f"Error processing image {url}: {img_error}")
-                    continue
+            # Download all images concurrently and hash them as they arrive
+            loop = asyncio.get_running_loop()
+            pending = {
+                asyncio.create_task(self._download_image(url)) for url in image_urls[:self.MAX_IMAGE_URLS]
+            }
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    blobs = [data for data in (task.result() for task in done) if data]
+                    if not blobs:
+                        continue
+
+                    # Decode and hash this batch off the event loop
+                    hashes = await loop.run_in_executor(self._cpu_pool, self._phash_images, blobs)
+
+                    if self._matches_official_hashes(hashes):
+                        return {"is_misuse": True, "score": 0.9}
+            finally:
+                # A match (or cancellation) makes the remaining downloads pointless
+                for task in pending:
+                    task.cancel()
 
-            return {"is_misuse": misuse_detected, "score": misuse_score}
+            return {"is_misuse": False, "score": 0.0}
 
         except Exception as e:
-            self.logger.error(f"Image analysis error: {e}")
+            self.logger.error("Image analysis error: %s", e)
             return {"is_misuse": False, "score": 0.0}
 
-    def _calculate_overall_score(self, scores: Dict) -> float:
+    async def _download_image(self, url: str) -> Optional[bytes]:
         try:
-            weights = {
-                "toxicity": 0.3,
-                "sentiment": 0.1,
-                "fake_account": 0.2,
-                "image_misuse": 0.15,
-                "llm_confidence": 0.25
-            }
+            # Only public http(s) hosts; IP literals skip the resolver so are checked here
+            parsed = URL(url)
+            if parsed.scheme not in ("http", "https") or not parsed.host:
+                return None
+            try:
+                if not is_public_address(parsed.host):
+                    return None
+            except ValueError:
+                pass  # A host name, vetted by PublicAddressResolver at connect time
+
+            # Redirects are not followed; they could point back inside the network
+            async with self._http.get(url, allow_redirects=False) as response:
+                if response.status != 200:
+                    return None
+                if (response.content_length or 0) > self.MAX_IMAGE_BYTES:
+                    return None
+
+                # Stream in chunks so an unannounced oversized body is cut off early
+                data = bytearray()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    data.extend(chunk)
+                    if len(data) > self.MAX_IMAGE_BYTES:
+                        return None
+                return bytes(data)
+        except Exception as e:
+            self.logger.error("Error downloading image %s: %s", url, e)
+            return None
+
+    def _phash_images(self, blobs: List[bytes]) -> np.ndarray:
+        """Compute 64-bit pHashes for a batch of encoded images with one stacked DCT.
+
+        Bit-for-bit equivalent to imagehash.phash(hash_size=8): 32x32 grayscale,
+        2-D DCT-II, top-left 8x8 block thresholded at its median, row-major bits.
+        """
+        pixels = []
+        for data in blobs:
+            try:
+                image = Image.open(BytesIO(data)).convert("L").resize((32, 32), Image.LANCZOS)
+                pixels.append(np.asarray(image, dtype=np.float64))
+            except Exception as e:
+                self.logger.error("Error decoding image: %s", e)
+
+        if not pixels:
+            return np.empty(0, dtype=np.uint64)
+
+        dct = scipy.fft.dctn(np.stack(pixels), type=2, axes=(-2, -1))
+        low = dct[:, :8, :8].reshape(len(pixels), 64)
+        bits = low > np.median(low, axis=1, keepdims=True)
+        return np.packbits(bits, axis=1).view(">u8").ravel().astype(np.uint64)
+
+    def _matches_official_hashes(self, hashes: np.ndarray) -> bool:
+        """Check whether any hash is within image_hash_max_distance bits of an official hash"""
+        if not hashes.size or not self._official_hashes_u64.size:
+            return False
+
+        # One query at a time over fixed-size slices of the (possibly memmapped) table, so
+        # memory stays bounded and a hit returns without touching the rest
+        official = self._official_hashes_u64
+        for query in hashes:
+            for start in range(0, official.size, self.OFFICIAL_HASH_SCAN_CHUNK):
+                diff = official[start:start + self.OFFICIAL_HASH_SCAN_CHUNK] ^ query
+                if hasattr(np, "bitwise_count"):
+                    # NumPy >= 2.0 maps this straight onto the hardware popcount
+                    distances = np.bitwise_count(diff)
+                else:
+                    distances = np.unpackbits(diff.view(np.uint8)).reshape(diff.size, 64).sum(axis=-1)
+                if (distances <= self.image_hash_max_distance).any():
+                    return True
+        return False
 
+    def _calculate_overall_score(self, scores: Dict) -> float:
+        try:
             weighted_score = 0.0
             total_weight = 0.0
 
-            for score_type, score_value in scores.items():
-                if score_type in weights:
-                    weighted_score += score_value * weights[score_type]
-                    total_weight += weights[score_type]
+            for score_type, weight in self.SCORE_WEIGHTS:
+                score_value = scores.get(score_type)
+                if score_value is not None:
+                    weighted_score += score_value * weight
+                    total_weight += weight
 
             return weighted_score / total_weight if total_weight > 0 else 0.0
 
         except Exception as e:
-            self.logger.error(f"Error calculating overall score: {e}")
+            self.logger.error("Error calculating overall score: %s", e)
             return 0.0
 
-    def _mock_toxic_classifier(self, content: str):
-        threat_keywords = ["kill", "murder", "die", "hurt", "harm", "attack", "destroy"]
-        is_toxic = any(keyword in content.lower() for keyword in threat_keywords)
-        return [{"label": "TOXIC" if is_toxic else "NON_TOXIC",
-                 "score": 0.8 if is_toxic else 0.2}]
-
-    def _mock_sentiment_analyzer(self, content: str):
-        negative_keywords = ["hate", "awful", "terrible", "disgusting", "worst"]
-        is_negative = any(keyword in content.lower() for keyword in negative_keywords)
-        return [{"label": "NEGATIVE" if is_negative else "POSITIVE",
-                 "score": 0.7 if is_negative else 0.3}]
+    def _mock_toxic_classifier(self, texts: List[str], **kwargs):
+        results = []
+        for content in texts:
+            is_toxic = "toxic" in self._scan_keywords(content.lower(), whole_words=True)
+            results.append({"label": "TOXIC" if is_toxic else "NON_TOXIC",
+                            "score": 0.8 if is_toxic else 0.2})
+        return results
+
+    def _mock_sentiment_analyzer(self, texts: List[str], **kwargs):
+        results = []
+        for content in texts:
+            is_negative = "negative" in self._scan_keywords(content.lower(), whole_words=True)
+            results.append({"label": "NEGATIVE" if is_negative else "POSITIVE",
+                            "score": 0.7 if is_negative else 0.3})
+        return results
@@ -0,0 +1,59 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from threat_detection import ThreatDetectionEngine  # noqa: E402
+
+
+# Threatening posts that still contain a "positive" word
+POSITIVE_WORDED_THREATS = [
+    "Can't wait to see Celebrity VIP suffer for what they did",
+    "I love how Celebrity VIP is going to get what's coming",
+]
+
+
+class RecordingBatcher:
+    """Stands in for an InferenceBatcher and records every text it is asked to classify"""
+
+    def __init__(self, label: str, score: float):
+        self.label = label
+        self.score = score
+        self.texts = []
+
+    async def submit(self, text: str):
+        self.texts.append(text)
+        return {"label": self.label, "score": self.score}
+
+
+def make_engine(monkeypatch, skip_benign: bool = False) -> ThreatDetectionEngine:
+    monkeypatch.setenv("SKIP_BENIGN_INFERENCE", "true" if skip_benign else "false")
+    engine = ThreatDetectionEngine()
+    engine._toxic_batcher = RecordingBatcher("TOXIC", 0.9)
+    engine._sentiment_batcher = RecordingBatcher("NEGATIVE", 0.9)
+    return engine
+
+
+@pytest.mark.parametrize("content", POSITIVE_WORDED_THREATS)
+def test_positive_worded_threats_reach_the_models(monkeypatch, content):
+    engine = make_engine(monkeypatch)
+
+    result = asyncio.run(engine.analyze_post(content, "regular_user", "twitter"))
+
+    assert engine._toxic_batcher.texts == [content]
+    assert engine._sentiment_batcher.texts == [content]
+    assert result["scores"]["toxicity"] == 0.9
+    assert result["is_threat"] is True
+
+
+def test_skipped_posts_leave_model_scores_out(monkeypatch):
+    engine = make_engine(monkeypatch, skip_benign=True)
+
+    result = asyncio.run(engine.analyze_post("So proud of Celebrity VIP!", "regular_user", "twitter"))
+
+    assert engine._toxic_batcher.texts == []
+    assert "toxicity" not in result["scores"]
+    assert "sentiment" not in result["scores"]